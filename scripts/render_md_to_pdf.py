@@ -1,19 +1,37 @@
 #!/usr/bin/env python3
 """
-Render Markdown to a styled PDF using Python-Markdown + WeasyPrint.
+Render Markdown to a styled PDF using markdown-it-py + WeasyPrint.
 
 Usage:
-  .venv/bin/python scripts/render_md_to_pdf.py input.md output.pdf
+  .venv/bin/python scripts/render_md_to_pdf.py input.md output.pdf [input2.md output2.pdf ...]
+  .venv/bin/python scripts/render_md_to_pdf.py --input-dir docs [--glob "*.md"] [--output-dir DIR] [--jobs N] [--toc]
+
+Directory mode writes <name>.pdf next to each source unless --output-dir is given,
+in which case the source's subfolder layout under --input-dir is mirrored there.
+Multiple documents are rendered in parallel worker processes.
 """
 
 from __future__ import annotations
 
+import argparse
+import hashlib
 import html
-import sys
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 from pathlib import Path
 
-import markdown
+from markdown_it import MarkdownIt
+from mdit_py_plugins.anchors import anchors_plugin
+from weasyprint import CSS as WeasyCSS
 from weasyprint import HTML
+from weasyprint.text.fonts import FontConfiguration
+
+
+# Keep the parser minimal: the docs only need tables (fences are core CommonMark).
+MARKDOWN_RULES = [
+    "table",
+]
 
 
 CSS = """
@@ -90,53 +108,194 @@ hr {
 }
 """
 
+# Parsed once and shared by every render instead of re-tokenizing an inline <style>.
+# The font configuration and image cache likewise persist across renders so
+# fonts are loaded and images decoded once per process.
+FONT_CONFIG = FontConfiguration()
+IMAGE_CACHE: dict = {}
+STYLESHEET = WeasyCSS(string=CSS, font_config=FONT_CONFIG)
 
-def wrap_html(title: str, body_html: str) -> str:
-    return f"""<!doctype html>
+
+# Static document fragments, assembled once at import.
+_PRE_TITLE = """<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
-  <title>{html.escape(title)}</title>
-  <style>
-{CSS}
-  </style>
+  <title>"""
+_POST_TITLE = """</title>
 </head>
 <body>
-{body_html}
+"""
+_TAIL = """
 </body>
 </html>
 """
 
 
-def main() -> int:
-    if len(sys.argv) != 3:
-        print("Usage: render_md_to_pdf.py <input.md> <output.pdf>")
-        return 2
+def wrap_html(title: str, body_html: str) -> str:
+    return _PRE_TITLE + html.escape(title) + _POST_TITLE + body_html + _TAIL
 
-    input_path = Path(sys.argv[1]).resolve()
-    output_path = Path(sys.argv[2]).resolve()
-    if not input_path.is_file():
-        print(f"Input not found: {input_path}")
-        return 2
 
-    md_text = input_path.read_text(encoding="utf-8")
-    body_html = markdown.markdown(
+def build_markdown(toc: bool = False) -> MarkdownIt:
+    md = MarkdownIt("commonmark", {"html": True}).enable(MARKDOWN_RULES)
+    if toc:
+        # Heading ids for in-document links; only paid for when requested.
+        md.use(anchors_plugin, max_level=6)
+    return md
+
+
+# One parser per toc setting, built on first use in each process.
+_PARSERS: dict[bool, MarkdownIt] = {}
+
+
+def get_markdown(toc: bool = False) -> MarkdownIt:
+    md = _PARSERS.get(toc)
+    if md is None:
+        md = _PARSERS[toc] = build_markdown(toc)
+    return md
+
+
+def source_digest(md_text: str, title: str, base_url: str, toc: bool = False) -> str:
+    # Everything the PDF depends on besides the source text goes into the digest
+    # too (stylesheet, parser rules and toc flag, HTML wrapper, title, resource
+    # base), so changing any of it still triggers a re-render.
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (
+        CSS,
+        ",".join(MARKDOWN_RULES),
+        "toc=1" if toc else "toc=0",
+        _PRE_TITLE,
+        _POST_TITLE,
+        _TAIL,
+        title,
+        base_url,
         md_text,
-        extensions=[
-            "extra",
-            "tables",
-            "fenced_code",
-            "sane_lists",
-            "toc",
-        ],
-        output_format="html5",
-    )
+    ):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def render(input_path: Path, output_path: Path, toc: bool = False) -> bool:
+    """Render one document; returns False when the existing PDF is up to date."""
+    md_text = input_path.read_text(encoding="utf-8")
     title = input_path.stem.replace("_", " ")
+    base_url = str(input_path.parent)
+    digest = source_digest(md_text, title, base_url, toc)
+    digest_path = output_path.with_suffix(".pdf.sha")
+    if (
+        output_path.is_file()
+        and digest_path.is_file()
+        and digest_path.read_text(encoding="utf-8").strip() == digest
+    ):
+        return False
+
+    body_html = get_markdown(toc).render(md_text)
     html_doc = wrap_html(title, body_html)
 
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    HTML(string=html_doc, base_url=str(input_path.parent)).write_pdf(str(output_path))
-    print(f"Rendered {input_path} -> {output_path}")
+    HTML(string=html_doc, base_url=base_url).write_pdf(
+        str(output_path),
+        stylesheets=[STYLESHEET],
+        font_config=FONT_CONFIG,
+        cache=IMAGE_CACHE,
+    )
+    digest_path.write_text(digest + "\n", encoding="utf-8")
+    return True
+
+
+def _render_one(job: tuple[Path, Path], toc: bool) -> tuple[Path, Path, bool]:
+    input_path, output_path = job
+    return input_path, output_path, render(input_path, output_path, toc)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Render Markdown documents to styled PDFs.")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        metavar="PATH",
+        help="input.md output.pdf pairs",
+    )
+    parser.add_argument("--input-dir", type=Path, help="render every matching file in this directory")
+    parser.add_argument("--glob", default="*.md", help="pattern for --input-dir (default: *.md)")
+    parser.add_argument("--output-dir", type=Path, help="where --input-dir PDFs go (default: next to sources)")
+    parser.add_argument("--toc", action="store_true", help="add ids to headings for in-document links")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="worker processes")
+    args = parser.parse_args(argv)
+    if len(args.paths) % 2 != 0:
+        parser.error("positional paths must be <input.md> <output.pdf> pairs")
+    if not args.paths and args.input_dir is None:
+        parser.error("give <input.md> <output.pdf> pairs or --input-dir")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    return args
+
+
+def collect_jobs(args: argparse.Namespace) -> list[tuple[Path, Path]]:
+    """Resolve (input, output) pairs; raises ValueError if two jobs share an output."""
+    jobs = [
+        (Path(args.paths[i]).resolve(), Path(args.paths[i + 1]).resolve())
+        for i in range(0, len(args.paths), 2)
+    ]
+    if args.input_dir is not None:
+        input_dir = args.input_dir.resolve()
+        output_dir = args.output_dir.resolve() if args.output_dir is not None else None
+        for input_path in sorted(input_dir.glob(args.glob)):
+            if not input_path.is_file():
+                continue
+            if output_dir is None:
+                output_path = input_path.with_suffix(".pdf")
+            else:
+                output_path = output_dir / input_path.relative_to(input_dir).with_suffix(".pdf")
+            jobs.append((input_path, output_path))
+
+    # Workers write concurrently, so two jobs must never target the same file.
+    sources_by_output: dict[Path, Path] = {}
+    for input_path, output_path in jobs:
+        previous = sources_by_output.get(output_path)
+        if previous is not None:
+            raise ValueError(
+                f"Output {output_path} would be written twice (from {previous} and {input_path})"
+            )
+        sources_by_output[output_path] = input_path
+    return jobs
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    try:
+        jobs = collect_jobs(args)
+    except ValueError as exc:
+        print(exc)
+        return 2
+    for input_path, _ in jobs:
+        if not input_path.is_file():
+            print(f"Input not found: {input_path}")
+            return 2
+    if not jobs:
+        print(f"No files matching {args.glob!r} in {args.input_dir}")
+        return 2
+
+    workers = min(args.jobs, len(jobs))
+    render_job = partial(_render_one, toc=args.toc)
+    if workers == 1:
+        results = [render_job(job) for job in jobs]
+    else:
+        # Warm each worker's parser up front. Stylesheet and font state are
+        # module-level, so each worker already builds them once at import.
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=get_markdown,
+            initargs=(args.toc,),
+        ) as executor:
+            results = list(executor.map(render_job, jobs))
+
+    for input_path, output_path, rendered in results:
+        if rendered:
+            print(f"Rendered {input_path} -> {output_path}")
+        else:
+            print(f"Unchanged {input_path}, skipped {output_path}")
     return 0
 
 
@@ -1,35 +1,91 @@
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable
+
+# Sentinel for single-probe dict lookups (IDs are ints, so None would also work,
+# but an explicit sentinel keeps the miss check unambiguous).
+_MISSING = object()
+
+
 class IDMapper:
     """
     A builder-helper class to maintain Client ID (str) <-> Engine ID (int) mappings.
     Designed for the construction phase before data is passed to the immutable Java layer.
     """
 
+    __slots__ = ("_str_to_int", "_int_to_str", "_frozen_keys", "_frozen_ids")
+
     def __init__(self):
-        # Forward mapping: String -> Int
-        self._str_to_int: dict[str, int] = {}
-        # Reverse mapping: Int -> String
+        # Forward mapping: String -> Int. Dropped (None) once frozen.
+        self._str_to_int: dict[str, int] | None = {}
+        # Reverse mapping: Int -> String. Entries reference the same str objects
+        # as the forward keys, so this costs one pointer per ID, not a second copy.
         self._int_to_str: list[str] = []
+        # Frozen mode: external IDs in sorted order with their internal IDs
+        # aligned by position (int32). Replaces the forward dict on freeze().
+        self._frozen_keys: list[str] | None = None
+        self._frozen_ids: array | None = None
 
     def get_or_create(self, external_id: str) -> int:
         """
         Gets the existing internal ID for a string, or creates a new one
         if it doesn't exist.
         """
-        if external_id in self._str_to_int:
-            return self._str_to_int[external_id]
+        str_to_int = self._str_to_int
+        if str_to_int is None:
+            return self._frozen_existing(external_id)
+
+        existing = str_to_int.get(external_id, _MISSING)
+        if existing is not _MISSING:
+            return existing
 
         # Assign new ID
         new_id = len(self._int_to_str)
-        self._str_to_int[external_id] = new_id
+        str_to_int[external_id] = new_id
         self._int_to_str.append(external_id)
 
         return new_id
 
+    def get_or_create_many(self, external_ids: Iterable[str]) -> array:
+        """
+        Batch form of get_or_create. Returns the internal IDs as a contiguous
+        int32 array ('i' typecode); wrap it with np.frombuffer(ids, dtype=np.int32)
+        for a zero-copy hand-off to flatbuffers' CreateNumpyVector.
+        """
+        str_to_int = self._str_to_int
+        if str_to_int is None:
+            return array("i", [self._frozen_existing(external_id) for external_id in external_ids])
+
+        # Bind hot lookups to locals once instead of per ID.
+        int_to_str = self._int_to_str
+        lookup = str_to_int.get
+        append = int_to_str.append
+
+        ids = []
+        ids_append = ids.append
+        for external_id in external_ids:
+            internal_id = lookup(external_id, _MISSING)
+            if internal_id is _MISSING:
+                internal_id = len(int_to_str)
+                str_to_int[external_id] = internal_id
+                append(external_id)
+            ids_append(internal_id)
+
+        return array("i", ids)
+
     def to_internal(self, external_id: str) -> int:
         """
         Look up internal ID. Raises KeyError if not found.
+        Once frozen, this is a binary search over the sorted external IDs.
         """
-        return self._str_to_int[external_id]
+        str_to_int = self._str_to_int
+        if str_to_int is not None:
+            return str_to_int[external_id]
+
+        internal_id = self._frozen_lookup(external_id)
+        if internal_id is _MISSING:
+            raise KeyError(external_id)
+        return internal_id
 
     def to_external(self, internal_id: int) -> str:
         """
@@ -43,17 +99,72 @@ class IDMapper:
         return self._int_to_str[internal_id]
 
     def contains_external(self, external_id: str) -> bool:
-        return external_id in self._str_to_int
+        str_to_int = self._str_to_int
+        if str_to_int is not None:
+            return external_id in str_to_int
+        return self._frozen_lookup(external_id) is not _MISSING
 
     def contains_internal(self, internal_id: int) -> bool:
         return 0 <= internal_id < len(self._int_to_str)
 
+    def freeze(self) -> None:
+        """
+        Switches to read-only mode: the forward dict is replaced by a sorted key
+        list and a compact int32 ID array, mirroring the sorted IdMapping layout
+        in the model. This trades O(1) hashed lookups for O(log N) binary search
+        in exchange for a smaller footprint. Existing IDs still resolve; creating
+        new ones raises RuntimeError. Raises TypeError if any external ID is not
+        a str, since the sorted layout needs mutually comparable keys.
+        """
+        str_to_int = self._str_to_int
+        if str_to_int is None:
+            return
+
+        for key in str_to_int:
+            if not isinstance(key, str):
+                raise TypeError(
+                    f"Cannot freeze IDMapper: external IDs must be str, got {type(key).__name__}: {key!r}"
+                )
+
+        frozen_keys = sorted(str_to_int)
+        self._frozen_ids = array("i", [str_to_int[key] for key in frozen_keys])
+        self._frozen_keys = frozen_keys
+        self._str_to_int = None
+
+    def is_frozen(self) -> bool:
+        return self._str_to_int is None
+
+    def _frozen_lookup(self, external_id: str):
+        """Binary search of the frozen keys; returns _MISSING if absent."""
+        # Frozen keys are all str; anything else is a miss, as it is for the dict.
+        if not isinstance(external_id, str):
+            return _MISSING
+        frozen_keys = self._frozen_keys
+        index = bisect_left(frozen_keys, external_id)
+        if index < len(frozen_keys) and frozen_keys[index] == external_id:
+            return self._frozen_ids[index]
+        return _MISSING
+
+    def _frozen_existing(self, external_id: str) -> int:
+        internal_id = self._frozen_lookup(external_id)
+        if internal_id is _MISSING:
+            raise RuntimeError(f"IDMapper is frozen; cannot add external ID: {external_id!r}")
+        return internal_id
+
     def size(self) -> int:
         return len(self._int_to_str)
 
+    # Aliases, so len(mapper) / `x in mapper` dispatch straight to the same
+    # function without an extra Python frame and cannot drift from the named API.
+    __len__ = size
+    __contains__ = contains_external
+
     def export_mappings(self) -> dict[str, int]:
         """
         Returns a copy of the mappings, suitable for passing to the
         Java IDMapper.createImmutable() factory.
         """
-        return self._str_to_int.copy()
\ No newline at end of file
+        str_to_int = self._str_to_int
+        if str_to_int is None:
+            return dict(zip(self._frozen_keys, self._frozen_ids))
+        return str_to_int.copy()
\ No newline at end of file
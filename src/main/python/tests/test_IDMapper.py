@@ -32,6 +32,88 @@ class TestIDMapper(unittest.TestCase):
         self.assertEqual(id1, id2)
         self.assertEqual(self.mapper.size(), 1)
 
+    def test_get_or_create_many(self):
+        """Batch mapping reuses existing IDs and returns an int32 array"""
+        id_b = self.mapper.get_or_create("B")
+
+        ids = self.mapper.get_or_create_many(["A", "B", "C", "A"])
+
+        self.assertEqual(ids.typecode, "i")
+        self.assertEqual(ids.itemsize, 4)
+        self.assertEqual(ids.tolist(), [1, id_b, 2, 1])
+        self.assertEqual(self.mapper.size(), 3)
+        self.assertEqual(self.mapper.to_external(2), "C")
+        self.assertEqual(len(self.mapper.get_or_create_many(iter([]))), 0)
+
+    def test_freeze_lookups(self):
+        """Frozen mode resolves existing IDs via the sorted arrays"""
+        for name in ["Delta", "Alpha", "Charlie", "Bravo"]:
+            self.mapper.get_or_create(name)
+
+        self.assertFalse(self.mapper.is_frozen())
+        self.mapper.freeze()
+        self.assertTrue(self.mapper.is_frozen())
+
+        self.assertEqual(self.mapper.to_internal("Delta"), 0)
+        self.assertEqual(self.mapper.to_internal("Alpha"), 1)
+        self.assertEqual(self.mapper.to_internal("Bravo"), 3)
+        self.assertEqual(self.mapper.to_external(2), "Charlie")
+        with self.assertRaises(KeyError):
+            self.mapper.to_internal("Echo")
+        with self.assertRaises(KeyError):
+            self.mapper.to_internal("Aardvark")
+
+        self.assertTrue(self.mapper.contains_external("Charlie"))
+        self.assertFalse(self.mapper.contains_external("Echo"))
+        self.assertIn("Bravo", self.mapper)
+        self.assertNotIn("Echo", self.mapper)
+        self.assertEqual(
+            self.mapper.export_mappings(),
+            {"Delta": 0, "Alpha": 1, "Charlie": 2, "Bravo": 3},
+        )
+
+        # Freezing again is a no-op
+        self.mapper.freeze()
+        self.assertEqual(len(self.mapper), 4)
+        self.assertEqual(self.mapper.to_internal("Bravo"), 3)
+
+    def test_freeze_rejects_new_ids(self):
+        """Frozen mapper returns existing IDs but refuses new ones"""
+        id_a = self.mapper.get_or_create("A")
+        self.mapper.freeze()
+
+        # Existing IDs still resolve through the create paths
+        self.assertEqual(self.mapper.get_or_create("A"), id_a)
+        self.assertEqual(self.mapper.get_or_create_many(["A"]).tolist(), [id_a])
+
+        with self.assertRaises(RuntimeError):
+            self.mapper.get_or_create("B")
+        with self.assertRaises(RuntimeError):
+            self.mapper.get_or_create_many(["A", "B"])
+        self.assertEqual(self.mapper.size(), 1)
+
+    def test_freeze_non_str_miss_matches_unfrozen(self):
+        """Non-str lookups miss the same way before and after freeze"""
+        self.mapper.get_or_create("A")
+
+        for frozen in (False, True):
+            if frozen:
+                self.mapper.freeze()
+            self.assertFalse(self.mapper.contains_external(5))
+            self.assertNotIn(5, self.mapper)
+            with self.assertRaises(KeyError):
+                self.mapper.to_internal(5)
+
+    def test_freeze_rejects_non_str_keys(self):
+        """freeze() needs comparable str keys and leaves the mapper usable if not"""
+        self.mapper.get_or_create("A")
+        self.mapper.get_or_create(7)
+
+        with self.assertRaises(TypeError):
+            self.mapper.freeze()
+        self.assertFalse(self.mapper.is_frozen())
+        self.assertEqual(self.mapper.to_internal(7), 1)
+
     def test_error_handling(self):
         """Verify correct exceptions are raised for invalid IDs."""
         self.mapper.get_or_create("Existing")  # ID 0
@@ -117,5 +199,16 @@ class TestIDMapper(unittest.TestCase):
         self.assertTrue(self.mapper.contains_internal(id_a))
         self.assertFalse(self.mapper.contains_internal(9999))
 
+    def test_len_and_in_operators(self):
+        """Test len() and the in operator"""
+        self.assertEqual(len(self.mapper), 0)
+
+        self.mapper.get_or_create("A")
+        self.mapper.get_or_create("B")
+
+        self.assertEqual(len(self.mapper), 2)
+        self.assertIn("A", self.mapper)
+        self.assertNotIn("Z", self.mapper)
+
 if __name__ == "__main__":
     unittest.main()